@@ -0,0 +1,53 @@
+"""Measures the fixed cost of traversing small Recursive structures
+
+Usage, from the root of the repository:
+
+    PYTHONPATH=. python benchmarks/bench_abc.py
+
+"""
+
+from timeit import repeat
+
+from recur.abc import Recursive, postorder, preorder
+
+
+class Node(Recursive):
+
+    def __init__(self):
+        self.children = []
+
+    def __recur__(self):
+        return self.children
+
+
+def build(n):
+    """Builds a tree of n nodes where each node has up to two children"""
+
+    nodes = [Node() for _ in range(n)]
+    for i, node in enumerate(nodes[1:], 1):
+        nodes[(i - 1) // 2].children.append(node)
+
+    return nodes[0]
+
+
+def bench(name, func, number=20000):
+    best = min(repeat(func, number=number, repeat=5)) / number
+    print('{:<40}{:>12.2f} us'.format(name, best * 1e6))
+
+
+def main():
+
+    def prune(node):
+        return False
+
+    for n in (1, 3, 9):
+        root = build(n)
+        print('Tree with {} nodes'.format(n))
+        bench('  preorder', lambda: list(preorder(root)))
+        bench('  postorder', lambda: list(postorder(root)))
+        bench('  preorder with prune', lambda: list(preorder(root, prune)))
+        bench('  iter', lambda: list(root))
+
+
+if __name__ == '__main__':
+    main()
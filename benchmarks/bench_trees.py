@@ -0,0 +1,65 @@
+"""Compares the TreeIterator with the generic RecursiveIterator
+
+Usage, from the root of the repository:
+
+    PYTHONPATH=. python benchmarks/bench_trees.py
+
+The generic iterator is quadratic in the number of nodes, so the largest
+tree is only timed once and takes about a minute.
+
+"""
+
+from timeit import repeat
+
+from recur.abc import Order, RecursiveIterator
+from recur.trees import Tree, TreeIterator, leaves
+
+
+def build(depth, children):
+    """Builds a complete tree with the given depth and branching"""
+
+    root = Tree()
+    if depth > 0:
+        for _ in range(children):
+            root.add(build(depth - 1, children))
+
+    return root
+
+
+def generic_leaves(tree):
+    return (t for t in RecursiveIterator(tree, Order.PRE) if t.is_leaf)
+
+
+def bench(name, func, number):
+    repeats = 5 if number > 1 else 1
+    best = min(repeat(func, number=number, repeat=repeats)) / number
+    print('{:<40}{:>12.1f} us'.format(name, best * 1e6))
+    return best
+
+
+def main():
+
+    for depth, children in ((2, 3), (4, 3), (6, 3), (9, 3)):
+
+        tree = build(depth, children)
+        n = sum(1 for _ in TreeIterator(tree, Order.PRE))
+        number = max(1, 20000 // n)
+        print('Tree with {} nodes'.format(n))
+
+        for order in Order:
+            generic = bench(
+                '  generic {}'.format(order.name.lower()),
+                lambda: list(RecursiveIterator(tree, order)), number)
+            fast = bench(
+                '  fast {}'.format(order.name.lower()),
+                lambda: list(TreeIterator(tree, order)), number)
+            print('  speedup: {:.1f}x'.format(generic / fast))
+
+        generic = bench('  generic leaves',
+                        lambda: list(generic_leaves(tree)), number)
+        fast = bench('  fast leaves', lambda: list(leaves(tree)), number)
+        print('  speedup: {:.1f}x'.format(generic / fast))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,17 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from collections.abc import Callable, Iterator
+from collections.abc import Iterator
 
 
 # Possible iteration orders.
 Order = Enum('Order', 'PRE POST')
 Direction = Enum('Direction', 'FORWARD REVERSE')
 
+# Looking up enum members on their class is slow compared to a global
+# lookup. The members are cached here for the iteration hot paths.
+_PRE, _POST = Order.PRE, Order.POST
+_FORWARD, _REVERSE = Direction.FORWARD, Direction.REVERSE
+
 
 class Recursive(ABC):
     """Abstract base class for classes that provide the __recur__() method"""
@@ -18,11 +23,11 @@ class Recursive(ABC):
 
     def __iter__(self):
         """Iterate recursively over the structure in pre-order"""
-        return RecursiveIterator(self, Order.PRE)
+        return RecursiveIterator(self, _PRE)
 
     def __reversed__(self):
         """Iterate recursively over the structure in post-order"""
-        return RecursiveIterator(self, Order.POST)
+        return RecursiveIterator(self, _POST)
 
     @classmethod
     def __subclasshook__(cls, subclass):
@@ -63,7 +68,8 @@ class RecursiveIterator(Iterator):
 
         """
 
-        super().__init__()
+        # The Iterator base class has no __init__, so super().__init__() is
+        # not called. It would only add overhead to every sub iterator.
 
         if not isinstance(recursive, Recursive):
             raise TypeError(
@@ -71,7 +77,7 @@ class RecursiveIterator(Iterator):
                 'the __recur__ method'.format(Recursive))
         self.recursive = recursive
 
-        if order != Order.PRE and order != Order.POST:
+        if order is not _PRE and order is not _POST:
             raise ValueError('\'order\' must be {} or {}, not {}'
                              .format(Order.PRE, Order.POST, order))
         self.order = order
@@ -83,7 +89,7 @@ class RecursiveIterator(Iterator):
         self.prune = prune
 
         self._visited = [] if visited is None else visited
-        self.nextfun = (n for n in _nextfun(self))
+        self.nextfun = _nextfun(self)
 
     def __iter__(self):
         return self
@@ -92,7 +98,7 @@ class RecursiveIterator(Iterator):
         return next(self.nextfun)
 
     def __reversed__(self):
-        self.order = Order.POST
+        self.order = _POST
         return self
 
     @property
@@ -101,7 +107,7 @@ class RecursiveIterator(Iterator):
 
     @direction.setter
     def direction(self, direction):
-        if not isinstance(direction, Direction):
+        if direction is not _FORWARD and direction is not _REVERSE:
             raise ValueError('\'direction\' must be and instance of {}, '
                              'not {}.'.format(Direction, direction.__class__))
         self._direction = direction
@@ -117,7 +123,7 @@ class RecursiveIterator(Iterator):
 
     @prune.setter
     def prune(self, prune):
-        if prune is not None and not isinstance(prune, Callable):
+        if prune is not None and not callable(prune):
             raise ValueError('\'prune must be a Callable, not {}'
                              .format(prune))
         self._prune = prune
@@ -126,7 +132,7 @@ class RecursiveIterator(Iterator):
     def subitems(self):
 
         items = self.recursive.__recur__()
-        if self.direction == Direction.REVERSE:
+        if self._direction is _REVERSE:
             items = reversed(items)
 
         items = (item for item in items if item not in self._visited)
@@ -162,7 +168,7 @@ class MultiRecursive(ABC):
     """
 
     def __iter__(self):
-        return MultiRecursiveIterator(self, 0, Order.PRE)
+        return MultiRecursiveIterator(self, 0, _PRE)
 
     @abstractmethod
     def __multirecur__(self, index):
@@ -170,7 +176,7 @@ class MultiRecursive(ABC):
         pass
 
     def __reversed__(self):
-        return MultiRecursiveIterator(self, 0, Order.POST)
+        return MultiRecursiveIterator(self, 0, _POST)
 
     @classmethod
     def __subclasshook__(cls, subclass):
@@ -188,7 +194,8 @@ class MultiRecursiveIterator(Iterator):
     def __init__(self, multirecursive, index, order,
                  direction=Direction.FORWARD, visited=None, prune=None):
 
-        super().__init__()
+        # See RecursiveIterator.__init__ for why super().__init__() is not
+        # called.
 
         if not isinstance(multirecursive, MultiRecursive):
             raise TypeError(
@@ -196,7 +203,7 @@ class MultiRecursiveIterator(Iterator):
                 'the __multirecur__ method'.format(MultiRecursive))
         self.multirecursive = multirecursive
 
-        if order != Order.PRE and order != Order.POST:
+        if order is not _PRE and order is not _POST:
             raise ValueError('\'order\' must be {} or {}, not {}'
                              .format(Order.PRE, Order.POST, order))
         self.order = order
@@ -209,7 +216,7 @@ class MultiRecursiveIterator(Iterator):
 
         self._visited = [] if visited is None else visited
         self.index = index
-        self.nextfun = (n for n in _nextfun(self))
+        self.nextfun = _nextfun(self)
 
     def __iter__(self):
         return self
@@ -218,7 +225,7 @@ class MultiRecursiveIterator(Iterator):
         return next(self.nextfun)
 
     def __reversed__(self):
-        self.order = Order.POST
+        self.order = _POST
         return self
 
     @property
@@ -227,7 +234,7 @@ class MultiRecursiveIterator(Iterator):
 
     @direction.setter
     def direction(self, direction):
-        if not isinstance(direction, Direction):
+        if direction is not _FORWARD and direction is not _REVERSE:
             raise ValueError('\'direction\' must be and instance of {}, '
                              'not {}.'.format(Direction, direction.__class__))
         self._direction = direction
@@ -244,7 +251,7 @@ class MultiRecursiveIterator(Iterator):
     @prune.setter
     def prune(self, prune):
 
-        if prune is not None and not isinstance(prune, Callable):
+        if prune is not None and not callable(prune):
             raise ValueError('\'prune must be a Callable, not {}'
                              .format(prune))
         self._prune = prune
@@ -253,7 +260,7 @@ class MultiRecursiveIterator(Iterator):
     def subitems(self):
 
         items = self.multirecursive.__multirecur__(self.index)
-        if self.direction == Direction.REVERSE:
+        if self._direction is _REVERSE:
             items = reversed(items)
 
         items = (item for item in items if item not in self._visited)
@@ -279,18 +286,18 @@ class MultiRecursiveIterator(Iterator):
 
 
 def ancestors(multirecursive):
-    return MultiRecursiveIterator(multirecursive, 1, Order.PRE)
+    return MultiRecursiveIterator(multirecursive, 1, _PRE)
 
 
 def descendants(multirecursive):
-    return MultiRecursiveIterator(multirecursive, 0, Order.PRE)
+    return MultiRecursiveIterator(multirecursive, 0, _PRE)
 
 
 def postorder(iterable, prune=None):
     """Iterates over a Recursive or MultiRecursive structure in postorder"""
 
     iterator = iter(iterable)
-    iterator.order = Order.POST
+    iterator.order = _POST
     iterator.prune = prune
     return iterator
 
@@ -305,7 +312,7 @@ def preorder(iterable, prune=None):
     """
 
     iterator = iter(iterable)
-    iterator.order = Order.PRE
+    iterator.order = _PRE
     iterator.prune = prune
     return iterator
 
@@ -336,11 +343,23 @@ def _nextfun(iter):
     if iter.prune:
         return
 
-    if iter.order == Order.PRE:
+    order = iter.order
+    if order is _PRE:
         yield iter.item
 
+    # Delegate directly to the generators of the sub iterators to avoid
+    # going through their __next__ method for every item, unless it was
+    # overridden by a subclass.
     for subiter in iter.subiterators:
-        yield from subiter
+        if type(subiter).__next__ in _DELEGATE_NEXT:
+            yield from subiter.nextfun
+        else:
+            yield from subiter
 
-    if iter.order == Order.POST:
+    if order is _POST:
         yield iter.item
+
+
+# The __next__ methods that only forward to the nextfun generator.
+_DELEGATE_NEXT = frozenset((RecursiveIterator.__next__,
+                            MultiRecursiveIterator.__next__))
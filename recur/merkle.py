@@ -0,0 +1,159 @@
+from hashlib import sha256
+
+from recur.abc import Recursive
+
+
+class MerkleHashes(object):
+
+    def __init__(self, recursive, key):
+        """Merkle hashes of the subtrees of a Recursive structure
+
+        The MerkleHashes class computes a hash for every sub instance of a
+        Recursive structure in a single postorder pass. The hash of an
+        instance combines its own key with the hashes of its sub instances,
+        so two subtrees have the same hash if and only if (barring
+        collisions) they have the same keys arranged the same way. The
+        hashes are cached, which allows unchanged structures to be compared
+        in constant time.
+
+        The hashes are a snapshot of the structure at the time they are
+        computed. The __recur__ method is called once per instance and its
+        result is stored along with the hash, so diff compares the
+        structures as they were when hashed. If the structure is modified
+        afterwards, a new instance of MerkleHashes must be created.
+
+        Args:
+            recursive (Recursive): The instance for which to compute the
+                hashes. The hashes of all its sub instances are also
+                computed.
+            key (Callable): A callable that receives an instance of
+                Recursive and returns its key as a str or bytes. The key
+                should identify the content of the instance, excluding its
+                sub instances.
+
+        Raises:
+            TypeError if 'recursive' is not an instance of Recursive or if
+                'key' is not callable.
+            ValueError if the structure contains cycles.
+
+        """
+
+        if not isinstance(recursive, Recursive):
+            raise TypeError(
+                '\'recursive\' must be an instance of {} or implement '
+                'the __recur__ method'.format(Recursive))
+        self.recursive = recursive
+
+        if not callable(key):
+            raise TypeError('\'key\' must be a Callable, not {}'.format(key))
+        self.key = key
+
+        # The hashes are indexed using the id of the instances because
+        # Recursive instances are not required to be hashable. Each entry
+        # holds the instance, its sub instances and its hash. Keeping the
+        # instances ensures that their ids cannot be reused by other
+        # objects, including sub instances created on the fly by __recur__.
+        self._hashes = {}
+
+        # The structure is traversed in postorder using an explicit stack
+        # to support deep structures. Each entry holds an instance, its sub
+        # instances and an iterator over the ones that remain to be visited.
+        on_stack = {id(recursive)}
+        subitems = list(recursive.__recur__())
+        stack = [(recursive, subitems, iter(subitems))]
+        while stack:
+            item, subitems, remaining = stack[-1]
+
+            for subitem in remaining:
+                if id(subitem) in on_stack:
+                    raise ValueError('Cannot hash a structure with cycles.')
+                if id(subitem) not in self._hashes:
+                    on_stack.add(id(subitem))
+                    subsubitems = list(subitem.__recur__())
+                    stack.append((subitem, subsubitems, iter(subsubitems)))
+                    break
+
+            else:
+                stack.pop()
+                on_stack.remove(id(item))
+                self._hashes[id(item)] = (item, subitems,
+                                          self._hash(item, subitems))
+
+    def __getitem__(self, recursive):
+        """Returns the hash of the subtree rooted at 'recursive'"""
+        return self._entry(recursive)[2]
+
+    def __contains__(self, recursive):
+        entry = self._hashes.get(id(recursive))
+        return entry is not None and entry[0] is recursive
+
+    def __len__(self):
+        return len(self._hashes)
+
+    @property
+    def digest(self):
+        """The hash of the whole structure"""
+        return self._hashes[id(self.recursive)][2]
+
+    def _entry(self, recursive):
+        """Returns the instance, sub instances and hash of 'recursive'"""
+        entry = self._hashes.get(id(recursive))
+        if entry is None or entry[0] is not recursive:
+            raise KeyError(recursive)
+        return entry
+
+    def _hash(self, item, subitems):
+        """Computes the hash of an instance from the hashes of its subitems"""
+
+        key = self.key(item)
+        if isinstance(key, str):
+            key = key.encode()
+
+        digest = sha256(sha256(key).digest())
+        for subitem in subitems:
+            digest.update(self._hashes[id(subitem)][2])
+
+        return digest.digest()
+
+
+def diff(a, b):
+    """Iterator over the subtrees that differ between two structures
+
+    Returns a generator that yields the pairs of subtrees whose hashes
+    differ, in preorder. Only the subtrees with different hashes are
+    descended into, so identical structures are compared in constant time
+    and small edits cost in proportion to the length of the changed paths.
+    Sub instances are matched by position. If one structure has more sub
+    instances than the other, the missing ones are reported as None and
+    are not descended into. The structures are compared as they were when
+    hashed, using the sub instances stored by MerkleHashes.
+
+    Args:
+        a (MerkleHashes): The hashes of the first structure.
+        b (MerkleHashes): The hashes of the second structure.
+
+    """
+
+    # The stack holds the pairs that remain to be reported in reverse
+    # order. The pairs that must be compared are flagged with True, the
+    # added and removed sub instances with False.
+    stack = [(a.recursive, b.recursive, True)]
+    while stack:
+        item_a, item_b, compare = stack.pop()
+
+        if not compare:
+            yield item_a, item_b
+            continue
+
+        _, subitems_a, hash_a = a._entry(item_a)
+        _, subitems_b, hash_b = b._entry(item_b)
+        if hash_a == hash_b:
+            continue
+
+        yield item_a, item_b
+
+        n = min(len(subitems_a), len(subitems_b))
+        stack.extend((None, s, False) for s in reversed(subitems_b[n:]))
+        stack.extend((s, None, False) for s in reversed(subitems_a[n:]))
+        stack.extend((sa, sb, True) for sa, sb in
+                     zip(reversed(subitems_a[:n]), reversed(subitems_b[:n])))
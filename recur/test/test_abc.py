@@ -222,6 +222,22 @@ class TestMultiRecursiveIterator(unittest.TestCase):
 
 class TestRecursiveIterator(unittest.TestCase):
 
+    def test_init(self):
+        """Test the __init__ method of the RecursiveIterator class"""
+
+        node = Node(0)
+
+        # Must get an object that implements __recur__.
+        self.assertRaises(TypeError, RecursiveIterator, None, Order.PRE)
+
+        # Must get pre or post for the order, a direction and a callable.
+        self.assertRaises(ValueError, RecursiveIterator, node, 'a')
+        self.assertRaises(ValueError, RecursiveIterator, node, Order.PRE,
+                          direction='a')
+        self.assertRaises(ValueError, RecursiveIterator, node, Order.PRE,
+                          prune=1)
+        self.assertRaises(ValueError, preorder, node, prune=1)
+
     def test_cycles(self):
         """Test that we can iterate on a recursive struture with cycles"""
 
@@ -263,6 +279,42 @@ class TestRecursiveIterator(unittest.TestCase):
         nodes = [node for node in right_leaf]
         self.assertListEqual(nodes, [right_leaf, root, left_leaf])
 
+    def test_subclass(self):
+        """Test that subclasses can override prune and subiterators"""
+
+        root = Node(0)
+        for value in (1, 2):
+            root.add(Node(value))
+        root._children[0].add(Node(3))
+
+        class First(RecursiveIterator):
+            @property
+            def subiterators(self):
+                return (self.copy(i) for i in list(self.subitems)[:1])
+
+        class Pruned(RecursiveIterator):
+            @property
+            def prune(self):
+                return True
+
+            @prune.setter
+            def prune(self, prune):
+                self._prune = prune
+
+        class Next(RecursiveIterator):
+            def __next__(self):
+                return Node(-next(self.nextfun).value)
+
+        class Root(RecursiveIterator):
+            def copy(self, recursive):
+                return Next(recursive, self.order)
+
+        output = [n.value for n in First(root, Order.PRE)]
+        self.assertListEqual(output, [0, 1, 3])
+        self.assertListEqual(list(Pruned(root, Order.PRE)), [])
+        output = [n.value for n in Root(root, Order.PRE)]
+        self.assertListEqual(output, [0, -1, -3, -2])
+
     def test_pruning(self):
         """Test pruning with a simple tree"""
 
@@ -0,0 +1,166 @@
+import unittest
+
+from recur.abc import Recursive
+from recur.merkle import MerkleHashes, diff
+from recur.test.test_abc import DirectedGraphNode, Node
+
+
+def build(values):
+    """Builds a tree of Node from nested (value, [children]) tuples"""
+
+    value, children = values
+    node = Node(value)
+    for child in children:
+        node.add(build(child))
+
+    return node
+
+
+def key(node):
+    return str(node.value)
+
+
+class TestMerkleHashes(unittest.TestCase):
+
+    def test_hashes(self):
+        """Test that equal structures have equal hashes"""
+
+        values = (0, [(1, []), (2, [(3, []), (4, [])])])
+        a = build(values)
+        b = build(values)
+
+        hashes_a = MerkleHashes(a, key)
+        hashes_b = MerkleHashes(b, key)
+        self.assertEqual(len(hashes_a), 5)
+        self.assertEqual(hashes_a.digest, hashes_b.digest)
+        self.assertIn(a._children[1], hashes_a)
+        self.assertNotIn(b, hashes_a)
+
+        # The order of the sub instances matters.
+        c = build((0, [(2, [(3, []), (4, [])]), (1, [])]))
+        self.assertNotEqual(hashes_a.digest, MerkleHashes(c, key).digest)
+
+        # The subtree rooted at 2 is the same in both.
+        hashes_c = MerkleHashes(c, key)
+        self.assertEqual(hashes_a[a._children[1]], hashes_c[c._children[0]])
+
+    def test_errors(self):
+        """Test that invalid arguments and cycles raise errors"""
+
+        self.assertRaises(TypeError, MerkleHashes, None, key)
+        self.assertRaises(TypeError, MerkleHashes, Node(0), None)
+
+        one = DirectedGraphNode()
+        two = DirectedGraphNode()
+        one.link(two)
+        two.link(one)
+        self.assertRaises(ValueError, MerkleHashes, one, lambda n: b'')
+
+        with self.assertRaises(KeyError):
+            MerkleHashes(Node(0), key)[one]
+
+    def test_deep(self):
+        """Test that deep and shared structures can be hashed"""
+
+        nodes = [Node(i % 2) for i in range(5000)]
+        for parent, child in zip(nodes[:-1], nodes[1:]):
+            parent.add(child)
+
+        hashes = MerkleHashes(nodes[0], key)
+        self.assertEqual(len(hashes), 5000)
+        self.assertEqual(hashes[nodes[0]], hashes.digest)
+        self.assertNotEqual(hashes[nodes[0]], hashes[nodes[2]])
+
+        # Shared sub instances are hashed once.
+        root = Node(0)
+        shared = Node(1)
+        root.add(shared)
+        root.add(shared)
+        self.assertEqual(len(MerkleHashes(root, key)), 2)
+
+    def test_identity(self):
+        """Test that the hashes are looked up by identity"""
+
+        node = Node(0)
+        hashes = MerkleHashes(node, key)
+        self.assertIn(node, hashes)
+        self.assertNotIn(Node(0), hashes)
+
+
+class TestDiff(unittest.TestCase):
+
+    def test_diff(self):
+        """Test that diff only descends in the subtrees that differ"""
+
+        a = build((0, [(1, []), (2, [(3, []), (4, [])])]))
+        b = build((0, [(1, []), (2, [(3, []), (5, [])])]))
+
+        # Identical structures have no differences.
+        hashes_a = MerkleHashes(a, key)
+        self.assertListEqual(list(diff(hashes_a, hashes_a)), [])
+
+        # Only the path to the changed node is reported.
+        hashes_b = MerkleHashes(b, key)
+        output = [(x.value, y.value) for x, y in diff(hashes_a, hashes_b)]
+        self.assertListEqual(output, [(0, 0), (2, 2), (4, 5)])
+
+        # Added and removed sub instances are reported as None.
+        c = build((0, [(1, [(6, [])])]))
+        hashes_c = MerkleHashes(c, key)
+        output = [(x and x.value, y and y.value)
+                  for x, y in diff(hashes_a, hashes_c)]
+        self.assertListEqual(output, [(0, 0), (1, 1), (None, 6), (2, None)])
+
+    def test_deep(self):
+        """Test that diff supports deep structures"""
+
+        def chain(leaf):
+            nodes = [Node(0) for _ in range(3000)] + [Node(leaf)]
+            for parent, child in zip(nodes[:-1], nodes[1:]):
+                parent.add(child)
+            return nodes[0]
+
+        hashes_a = MerkleHashes(chain(1), key)
+        hashes_b = MerkleHashes(chain(2), key)
+        self.assertEqual(len(list(diff(hashes_a, hashes_b))), 3001)
+
+    def test_modified(self):
+        """Test that diff compares the structures as they were hashed"""
+
+        a = build((0, [(1, [])]))
+        b = build((0, [(2, [])]))
+        hashes_a = MerkleHashes(a, key)
+        hashes_b = MerkleHashes(b, key)
+        a.add(Node(3))
+        a._children.reverse()
+        output = [(x.value, y.value) for x, y in diff(hashes_a, hashes_b)]
+        self.assertListEqual(output, [(0, 0), (1, 2)])
+
+    def test_lazy(self):
+        """Test structures whose __recur__ creates new sub instances"""
+
+        class View(Recursive):
+            """A view over nested dictionaries"""
+
+            def __init__(self, name, value):
+                self.name = name
+                self.value = value
+
+            def __recur__(self):
+                if not isinstance(self.value, dict):
+                    return []
+                return [View(k, v) for k, v in sorted(self.value.items())]
+
+        def view_key(view):
+            if isinstance(view.value, dict):
+                return view.name
+            return '{}={}'.format(view.name, view.value)
+
+        a = View('root', {'x': {'y': 1, 'z': 2}, 'w': 3})
+        b = View('root', {'x': {'y': 1, 'z': 4}, 'w': 3})
+        hashes_a = MerkleHashes(a, view_key)
+        hashes_b = MerkleHashes(b, view_key)
+        self.assertEqual(len(hashes_a), 5)
+        output = [(x.name, y.name) for x, y in diff(hashes_a, hashes_b)]
+        self.assertListEqual(output, [('root', 'root'), ('x', 'x'),
+                                      ('z', 'z')])
@@ -1,7 +1,22 @@
 import unittest
 
+from random import randint
+
+from recur.abc import Direction, Order, Recursive, RecursiveIterator
 from recur.abc import postorder
-from recur.trees import Tree
+from recur.abc import preorder
+from recur.trees import Tree, TreeIterator, leaves
+
+
+def add_children(tree, depth, max_children):
+    """Recursively add children up to depth levels"""
+
+    if depth > 0:
+
+        for _ in range(randint(0, max_children)):
+            child = Tree()
+            tree.add(child)
+            add_children(child, depth - 1, max_children)
 
 
 class TestTree(unittest.TestCase):
@@ -21,3 +36,308 @@ class TestTree(unittest.TestCase):
         self.assertEqual([n for n in root], expected)
         expected = [left_leaf, right_leaf, branch, root]
         self.assertEqual([n for n in postorder(root)], expected)
+
+    def test_snapshot(self):
+        """Test that snapshots are immutable and share unchanged subtrees"""
+
+        left_leaf = Tree()
+        right_leaf = Tree()
+        branch = Tree()
+        root = Tree()
+        branch.add(left_leaf)
+        root.add(branch)
+        root.add(right_leaf)
+
+        snapshot = root.snapshot()
+        expected = [root, branch, left_leaf, right_leaf]
+        self.assertEqual([n.tree for n in snapshot], expected)
+
+        # The snapshot is only replaced when the tree changes.
+        self.assertIs(root.snapshot(), snapshot)
+
+        # Modifying the tree does not modify existing snapshots.
+        new_leaf = Tree()
+        branch.add(new_leaf)
+        self.assertEqual([n.tree for n in snapshot], expected)
+
+        new_snapshot = root.snapshot()
+        expected = [root, branch, left_leaf, new_leaf, right_leaf]
+        self.assertEqual([n.tree for n in new_snapshot], expected)
+        self.assertTrue(new_snapshot.__recur__()[1].is_leaf)
+
+        # Only the path to the modified node was copied.
+        self.assertIsNot(new_snapshot, snapshot)
+        self.assertIsNot(new_snapshot.__recur__()[0], snapshot.__recur__()[0])
+        self.assertIs(new_snapshot.__recur__()[1], snapshot.__recur__()[1])
+        self.assertIs(new_snapshot.__recur__()[0].__recur__()[0],
+                      snapshot.__recur__()[0].__recur__()[0])
+
+    def test_snapshot_deep(self):
+        """Test that snapshots can be taken of deep trees"""
+
+        # The tree is built from the bottom so that each addition is done
+        # on a root.
+        trees = [Tree() for _ in range(5000)]
+        for parent, child in reversed(list(zip(trees[:-1], trees[1:]))):
+            parent.add(child)
+
+        snapshot = trees[0].snapshot()
+        for tree in trees:
+            self.assertIs(snapshot.tree, tree)
+            snapshot = next(iter(snapshot.__recur__()), None)
+        self.assertIsNone(snapshot)
+
+        # Adding a leaf replaces the snapshots on the path to the root
+        # but does not modify them.
+        old_root = trees[0].snapshot()
+        old = trees[-1].snapshot()
+        trees[-1].add(Tree())
+        self.assertIsNot(trees[0].snapshot(), old_root)
+        self.assertTrue(old.is_leaf)
+        self.assertFalse(trees[-1].snapshot().is_leaf)
+
+    def test_snapshot_versions(self):
+        """Test that each snapshot is a version of the tree that existed"""
+
+        root = Tree()
+        a = Tree()
+        b = Tree()
+        root.add(a)
+        root.add(b)
+
+        def state(tree):
+            return [[c.tree for c in child.__recur__()]
+                    for child in tree.__recur__()]
+
+        snapshots = [root.snapshot()]
+        expected = [[[], []]]
+        for parent in (a, b, a, b, a):
+            parent.add(Tree())
+            snapshots.append(root.snapshot())
+            expected.append([list(a.__recur__()), list(b.__recur__())])
+
+        self.assertListEqual([state(s) for s in snapshots], expected)
+        self.assertIs(a.snapshot(), root.snapshot().__recur__()[0])
+
+    def test_wide_snapshot(self):
+        """Test snapshots of trees with many children"""
+
+        root = Tree()
+        children = [Tree() for _ in range(2000)]
+        for child in children:
+            root.add(child)
+        children[1500].add(Tree())
+
+        snapshot = root.snapshot()
+        self.assertEqual(len(snapshot.__recur__()), 2000)
+        self.assertListEqual([c.tree for c in snapshot.__recur__()],
+                             children)
+        self.assertListEqual([c.tree for c in reversed(snapshot.__recur__())],
+                             children[::-1])
+        self.assertIs(snapshot.__recur__()[-1].tree, children[-1])
+        self.assertFalse(snapshot.__recur__()[1500].is_leaf)
+        self.assertRaises(IndexError, snapshot.__recur__().__getitem__, 2000)
+
+    def test_add(self):
+        """Test that only roots can be added to a tree"""
+
+        child = Tree()
+        root = Tree()
+        root.add(child)
+        self.assertTrue(root.is_root)
+        self.assertFalse(child.is_root)
+        self.assertRaises(ValueError, Tree().add, child)
+
+    def test_tree_iterator(self):
+        """Test that the TreeIterator matches the RecursiveIterator"""
+
+        root = Tree()
+        add_children(root, depth=5, max_children=3)
+        nodes = list(RecursiveIterator(root, Order.PRE))
+        index = {id(n): i for i, n in enumerate(nodes)}
+
+        def prune(tree):
+            return index[id(tree)] % 3 == 1
+
+        self.assertIsInstance(iter(root), TreeIterator)
+        self.assertIsInstance(reversed(root), TreeIterator)
+        for order in Order:
+            for direction in Direction:
+                for p in (None, prune):
+                    expected = RecursiveIterator(root, order, direction,
+                                                 prune=p)
+                    output = TreeIterator(root, order, direction, prune=p)
+                    self.assertListEqual(list(output), list(expected))
+
+        self.assertListEqual(list(preorder(root, prune)),
+                             list(RecursiveIterator(root, Order.PRE,
+                                                    prune=prune)))
+        self.assertListEqual(list(postorder(root, prune)),
+                             list(RecursiveIterator(root, Order.POST,
+                                                    prune=prune)))
+        self.assertListEqual(list(leaves(root)),
+                             [n for n in nodes if n.is_leaf])
+
+        # A pruned root yields nothing.
+        self.assertListEqual(list(preorder(root, lambda t: True)), [])
+        self.assertListEqual(list(postorder(root, lambda t: True)), [])
+
+        self.assertRaises(TypeError, TreeIterator, None, Order.PRE)
+        self.assertRaises(ValueError, TreeIterator, root, 'a')
+
+    def test_subclass(self):
+        """Test that subclasses overriding __recur__ use the generic path"""
+
+        class Reversed(Tree):
+            def __recur__(self):
+                return tuple(reversed(self._children))
+
+        left_leaf = Tree()
+        right_leaf = Tree()
+        root = Reversed()
+        root.add(left_leaf)
+        root.add(right_leaf)
+
+        self.assertNotIsInstance(iter(root), TreeIterator)
+        self.assertListEqual(list(root), [root, right_leaf, left_leaf])
+        self.assertListEqual(list(leaves(root)), [right_leaf, left_leaf])
+
+    def test_subclass_descendant(self):
+        """Test that subclasses below the root are iterated correctly"""
+
+        class Reversed(Tree):
+            def __recur__(self):
+                return tuple(reversed(self._children))
+
+        class Leaf(Tree):
+            @property
+            def is_leaf(self):
+                return True
+
+        root = Tree()
+        child = Reversed()
+        leaf = Leaf()
+        left_leaf = Tree()
+        right_leaf = Tree()
+        root.add(child)
+        root.add(leaf)
+        child.add(left_leaf)
+        child.add(right_leaf)
+        leaf.add(Tree())
+
+        self.assertIsInstance(iter(root), TreeIterator)
+        for order in Order:
+            for direction in Direction:
+                expected = RecursiveIterator(root, order, direction)
+                output = TreeIterator(root, order, direction)
+                self.assertListEqual(list(output), list(expected))
+
+        expected = [n for n in RecursiveIterator(root, Order.PRE)
+                    if n.is_leaf]
+        self.assertListEqual(list(leaves(root)), expected)
+        self.assertEqual(len(expected), 4)
+
+    def test_subclass_cycle(self):
+        """Test subclasses whose __recur__ introduces cycles"""
+
+        class Up(Tree):
+            def __recur__(self):
+                return self._children + [self._parent]
+
+        root = Tree()
+        up = Up()
+        leaf = Tree()
+        root.add(up)
+        root.add(leaf)
+        up.add(Tree())
+
+        self.assertIsInstance(iter(root), TreeIterator)
+        for order in Order:
+            for direction in Direction:
+                expected = RecursiveIterator(root, order, direction)
+                output = TreeIterator(root, order, direction)
+                self.assertListEqual(list(output), list(expected))
+        self.assertEqual(len(list(root)), 4)
+
+    def test_leaves_mixed(self):
+        """Test leaves on structures with nodes that are not trees"""
+
+        class Value(Recursive):
+            def __init__(self):
+                self.is_leaf = True
+
+            def __recur__(self):
+                return []
+
+        class Mixed(Tree):
+            def __recur__(self):
+                return [Value()]
+
+        # The Mixed tree has no _children, so it is also a leaf.
+        root = Tree()
+        mixed = Mixed()
+        root.add(mixed)
+        output = list(leaves(root))
+        self.assertEqual(len(output), 2)
+        self.assertIs(output[0], mixed)
+        self.assertIsInstance(output[1], Value)
+
+    def test_lazy_pruning(self):
+        """Test that trees are pruned when they are reached"""
+
+        root = Tree()
+        for _ in range(3):
+            root.add(Tree())
+
+        def iterate(iterator, order):
+            """Prunes everything once two trees were returned"""
+            output = []
+            for tree in iterator(root, order,
+                                 prune=lambda t: len(output) >= 2):
+                output.append(tree)
+            return output
+
+        self.assertEqual(len(iterate(TreeIterator, Order.PRE)), 2)
+        for order in Order:
+            self.assertListEqual(iterate(TreeIterator, order),
+                                 iterate(RecursiveIterator, order))
+
+    def test_snapshot_iterator(self):
+        """Test that snapshots use the TreeIterator"""
+
+        # The tree is built from the bottom so that each addition is done
+        # on a root.
+        trees = [Tree() for _ in range(5000)]
+        for parent, child in reversed(list(zip(trees[:-1], trees[1:]))):
+            parent.add(child)
+
+        snapshot = trees[0].snapshot()
+        self.assertIsInstance(iter(snapshot), TreeIterator)
+        self.assertIsInstance(reversed(snapshot), TreeIterator)
+        self.assertListEqual([n.tree for n in snapshot], trees)
+        self.assertListEqual([n.tree for n in postorder(snapshot)],
+                             trees[::-1])
+        self.assertListEqual([n.tree for n in leaves(snapshot)], trees[-1:])
+
+    def test_tree_iterator_interface(self):
+        """Test that the TreeIterator mirrors the RecursiveIterator"""
+
+        left_leaf = Tree()
+        right_leaf = Tree()
+        root = Tree()
+        root.add(left_leaf)
+        root.add(right_leaf)
+
+        iterator = iter(root)
+        self.assertIsInstance(iterator, RecursiveIterator)
+        self.assertIs(iterator.recursive, root)
+        self.assertIs(iterator.item, root)
+        self.assertListEqual(list(iterator.subitems), [left_leaf, right_leaf])
+        subiterators = list(iterator.subiterators)
+        self.assertIsInstance(subiterators[0], TreeIterator)
+        self.assertIs(subiterators[1].recursive, right_leaf)
+        self.assertIs(iterator.copy(left_leaf).recursive, left_leaf)
+
+        iterator.direction = Direction.REVERSE
+        self.assertListEqual(list(iterator.subitems), [right_leaf, left_leaf])
+        self.assertListEqual(list(iterator), [root, right_leaf, left_leaf])
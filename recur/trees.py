@@ -1,4 +1,7 @@
+from itertools import chain
+
 from recur import Recursive
+from recur.abc import Direction, Order, RecursiveIterator
 
 
 class Tree(Recursive):
@@ -15,13 +18,31 @@ class Tree(Recursive):
 
         self._children = []
 
-        # Remember whether the tree is a root or not. Only roots can be added
-        # as children to other trees.
-        self._is_root = True
+        # Remember the parent of the tree and the index of the tree in the
+        # children of its parent. Only roots (trees without a parent) can be
+        # added as children to other trees.
+        self._parent = None
+        self._index = None
+
+        # The snapshot of the tree is always up to date. It is replaced,
+        # never modified, when the tree or one of its descendants changes.
+        self._snapshot = TreeSnapshot(self, _PersistentVector())
+
+    def __iter__(self):
+        """Iterate recursively over the tree in pre-order"""
+        if _has_fast_path(self):
+            return TreeIterator(self, Order.PRE)
+        return super().__iter__()
 
     def __recur__(self):
         return self._children
 
+    def __reversed__(self):
+        """Iterate recursively over the tree in post-order"""
+        if _has_fast_path(self):
+            return TreeIterator(self, Order.POST)
+        return super().__reversed__()
+
     @property
     def is_leaf(self):
         """Indicates if the tree is a leaf (has no children)"""
@@ -30,13 +51,15 @@ class Tree(Recursive):
     @property
     def is_root(self):
         """Indicates if the tree is a root (is not a child)"""
-        return self._is_root
+        return self._parent is None
 
     def add(self, tree):
         """Adds a child to the tree
 
         Adds a child to the tree by listing the supplied tree as a child.
-        The supplied tree must be a root.
+        The supplied tree must be a root. The snapshots of the tree and its
+        ancestors are updated in O(depth), see Tree.snapshot. Adding
+        children is not thread safe: concurrent writers must be serialized.
 
         Args:
             tree (Tree): The tree to add as a child. Must be a root.
@@ -51,9 +74,251 @@ class Tree(Recursive):
 
         # Once a tree is added as a child, it is not longer a root. Unless
         # it is tampered with, this will prevent cycles in the tree.
-        tree._is_root = False
+        tree._parent = self
+        tree._index = len(self._children)
         self._children.append(tree)
 
+        # Publish the change by copying the snapshots on the path to the
+        # root. Each new snapshot shares all the unchanged subtrees of the
+        # previous one and is published with a single assignment. The root
+        # is published last.
+        snapshot = TreeSnapshot(
+            self, self._snapshot._children.append(tree._snapshot))
+        self._snapshot = snapshot
+        node = self
+        while node._parent is not None:
+            parent = node._parent
+            children = parent._snapshot._children.set(node._index, snapshot)
+            snapshot = TreeSnapshot(parent, children)
+            parent._snapshot = snapshot
+            node = parent
+
+    def snapshot(self):
+        """Returns an immutable snapshot of the tree
+
+        Returns an immutable copy of the tree and its descendants that can
+        be safely traversed while the tree is modified, for example from
+        other threads. The snapshot is a version of the tree that existed
+        between two calls to Tree.add. It is built by Tree.add, which copies
+        the snapshots on the path from the modified tree to the root and
+        shares the snapshots of unchanged subtrees, so taking a snapshot
+        only reads a reference.
+
+        Returns:
+            TreeSnapshot: The snapshot of the tree.
+
+        """
+
+        return self._snapshot
+
+
+class TreeSnapshot(Recursive):
+
+    def __init__(self, tree, children):
+        """An immutable snapshot of a tree
+
+        The TreeSnapshot class is a read only version of a Tree at a given
+        point in time. It is created using the Tree.snapshot method and
+        should not be created directly.
+
+        Args:
+            tree (Tree): The tree from which the snapshot was taken.
+            children (_PersistentVector): The snapshots of the children of
+                the tree.
+
+        """
+
+        self._tree = tree
+        self._children = children
+
+    def __iter__(self):
+        """Iterate recursively over the snapshot in pre-order"""
+        if _has_fast_path(self):
+            return TreeIterator(self, Order.PRE)
+        return super().__iter__()
+
+    def __recur__(self):
+        return self._children
+
+    def __reversed__(self):
+        """Iterate recursively over the snapshot in post-order"""
+        if _has_fast_path(self):
+            return TreeIterator(self, Order.POST)
+        return super().__reversed__()
+
+    @property
+    def is_leaf(self):
+        """Indicates if the snapshot is a leaf (has no children)"""
+        return len(self._children) == 0
+
+    @property
+    def tree(self):
+        """The tree from which the snapshot was taken"""
+        return self._tree
+
+
+class _PersistentVector(object):
+
+    def __init__(self, size=0, shift=0, root=()):
+        """An immutable sequence with efficient updates
+
+        The _PersistentVector class stores the children of a TreeSnapshot.
+        It is a trie of tuples with up to 32 entries where the leaves hold
+        the items. Appending or replacing an item copies only the path to
+        that item and shares the rest of the trie, so it takes O(log n).
+
+        Args:
+            size (int): The number of items.
+            shift (int): The number of bits of the index consumed above the
+                leaves of the trie, i.e. 5 times the depth of the trie.
+            root (tuple): The root of the trie.
+
+        """
+
+        self._size = size
+        self._shift = shift
+        self._root = root
+
+    def __getitem__(self, index):
+
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('index out of range')
+
+        node = self._root
+        for level in range(self._shift, 0, -5):
+            node = node[(index >> level) & 31]
+
+        return node[index & 31]
+
+    def __iter__(self):
+        items = iter(self._root)
+        for _ in range(self._shift // 5):
+            items = chain.from_iterable(items)
+        return items
+
+    def __len__(self):
+        return self._size
+
+    def __reversed__(self):
+        items = reversed(self._root)
+        for _ in range(self._shift // 5):
+            items = chain.from_iterable(map(reversed, items))
+        return items
+
+    def append(self, item):
+        """Returns a new vector with the item appended"""
+
+        shift = self._shift
+        root = self._root
+
+        # If the trie is full, add a level above the root.
+        if self._size == 1 << (shift + 5):
+            root = (root,)
+            shift += 5
+
+        root = _append(root, shift, self._size, item)
+        return _PersistentVector(self._size + 1, shift, root)
+
+    def set(self, index, item):
+        """Returns a new vector with the item at 'index' replaced"""
+
+        if not 0 <= index < self._size:
+            raise IndexError('index out of range')
+
+        root = _set(self._root, self._shift, index, item)
+        return _PersistentVector(self._size, self._shift, root)
+
+
+class TreeIterator(RecursiveIterator):
+
+    def __init__(self, tree, order, direction=Direction.FORWARD,
+                 prune=None):
+        """Iterator specialized for Tree and TreeSnapshot instances
+
+        The TreeIterator class provides the same iteration properties as
+        the RecursiveIterator, but relies on the fact that trees and their
+        snapshots cannot contain cycles. It does not keep track of the
+        visited trees and accesses the children directly instead of going
+        through the __recur__ method. A tree whose class overrides __recur__
+        may introduce cycles, so it and its descendants are iterated by a
+        RecursiveIterator that tracks the visited trees. The TreeIterator is
+        used automatically when iterating over a Tree or a TreeSnapshot
+        whose class does not override __recur__.
+
+        Args:
+            tree (Tree or TreeSnapshot): The tree on which the iterator
+                operates.
+            order (Order): The iteration order. If Order.PRE, the iterator
+                returns the tree before its children. If Order.POST, the
+                iterator returns the children before the tree.
+            direction (Direction, optional): Indicates whether the children
+                should be reversed before being traversed.
+            prune (Callable): A callable that receives a tree and returns a
+                boolean value. If the returned value is True for a given
+                tree, it and all its descendants are ignored by the
+                iterator.
+
+        """
+
+        # RecursiveIterator.__init__ is not called because the visited
+        # trees are not tracked.
+
+        if not isinstance(tree, (Tree, TreeSnapshot)):
+            raise TypeError('\'tree\' must be an instance of {} or {}, not '
+                            '{}.'.format(Tree, TreeSnapshot, tree.__class__))
+        self.recursive = tree
+
+        if order != Order.PRE and order != Order.POST:
+            raise ValueError('\'order\' must be {} or {}, not {}'
+                             .format(Order.PRE, Order.POST, order))
+        self.order = order
+
+        # direction must be a Direction, verified in the setter.
+        self.direction = direction
+
+        # Prune must be callable, verified in the setter.
+        self.prune = prune
+
+        # The traversal is created on the first call to __next__ so that
+        # the order and prune can be changed after the creation of the
+        # iterator, e.g. by the preorder and postorder functions.
+        self._nextfun = None
+
+    def __next__(self):
+        nextfun = self._nextfun
+        if nextfun is None:
+            nextfun = self.nextfun
+        return next(nextfun)
+
+    @property
+    def nextfun(self):
+        if self._nextfun is None:
+            traverse = _preorder if self.order == Order.PRE else _postorder
+            self._nextfun = traverse(self.recursive, self.direction,
+                                     self._prune)
+        return self._nextfun
+
+    @property
+    def subitems(self):
+
+        items = _children(self.recursive)
+        if self.direction == Direction.REVERSE:
+            items = reversed(items)
+
+        return items
+
+    def copy(self, tree):
+        """Returns a new iterator with the same iteration properties
+
+        Returns a new iterator with the same iteration properties as the
+        one supplied, but that iterates on a different tree.
+
+        """
+        return TreeIterator(tree, self.order, direction=self.direction,
+                            prune=self._prune)
+
 
 def leaves(tree):
     """Iterator for the leaves of a tree
@@ -67,4 +332,143 @@ def leaves(tree):
 
     """
 
-    return (t for t in tree if t.is_leaf)
+    # Evaluating the is_leaf property is avoided for the trees whose class
+    # does not override it.
+    return (t for t in tree
+            if (not t._children
+                if getattr(type(t), 'is_leaf', None) in _FAST_IS_LEAF
+                else t.is_leaf))
+
+
+def _append(node, level, index, item):
+    """Appends an item to a node of a _PersistentVector trie"""
+
+    if level == 0:
+        return node + (item,)
+
+    i = (index >> level) & 31
+    if i < len(node):
+        return node[:i] + (_append(node[i], level - 5, index, item),)
+
+    # Create the path from a new child of the node to the item.
+    child = (item,)
+    for _ in range(level // 5 - 1):
+        child = (child,)
+
+    return node + (child,)
+
+
+def _set(node, level, index, item):
+    """Replaces an item in a node of a _PersistentVector trie"""
+
+    i = (index >> level) & 31
+    if level == 0:
+        return node[:i] + (item,) + node[i + 1:]
+
+    child = _set(node[i], level - 5, index, item)
+    return node[:i] + (child,) + node[i + 1:]
+
+
+def _children(tree):
+    """Returns the children of a tree, bypassing __recur__ if possible"""
+    if type(tree).__recur__ in _FAST_RECUR:
+        return tree._children
+    return tuple(tree.__recur__())
+
+
+def _has_fast_path(tree):
+    """Indicates if the tree can be iterated using the TreeIterator"""
+    return type(tree).__recur__ in _FAST_RECUR
+
+
+def _preorder(tree, direction, prune):
+
+    # The children are pushed on the stack in reverse order so that they
+    # are popped in the requested order. They are pruned when popped to
+    # match the RecursiveIterator, which prunes lazily.
+    forward = direction == Direction.FORWARD
+    fast = _FAST_RECUR
+    stack = [tree]
+    pop = stack.pop
+    extend = stack.extend
+
+    # The visited trees are recorded but only checked once a tree whose
+    # class overrides __recur__ was found, because its __recur__ may
+    # introduce cycles. Such trees are delegated to a RecursiveIterator
+    # that shares the visited trees.
+    visited = []
+    check = False
+    while stack:
+        node = pop()
+        if check and node in visited:
+            continue
+
+        if type(node).__recur__ not in fast:
+            check = True
+            yield from RecursiveIterator(node, Order.PRE, direction,
+                                         visited=visited, prune=prune)
+            continue
+
+        visited.append(node)
+        if prune is not None and prune(node):
+            continue
+
+        yield node
+
+        children = node._children
+        if children:
+            extend(reversed(children) if forward else children)
+
+
+def _postorder(tree, direction, prune):
+
+    # See _preorder for the handling of the visited trees.
+    visited = []
+    check = False
+    if type(tree).__recur__ not in _FAST_RECUR:
+        yield from RecursiveIterator(tree, Order.POST, direction,
+                                     visited=visited, prune=prune)
+        return
+
+    visited.append(tree)
+    if prune is not None and prune(tree):
+        return
+
+    # Each entry of the stack holds a tree and an iterator over the
+    # children that remain to be traversed.
+    forward = direction == Direction.FORWARD
+    fast = _FAST_RECUR
+    stack = [(tree, _subiterator(tree, forward))]
+    append = stack.append
+    pop = stack.pop
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if check and child in visited:
+                continue
+
+            if type(child).__recur__ not in fast:
+                check = True
+                yield from RecursiveIterator(child, Order.POST, direction,
+                                             visited=visited, prune=prune)
+                continue
+
+            visited.append(child)
+            if prune is None or not prune(child):
+                append((child, _subiterator(child, forward)))
+                break
+        else:
+            pop()
+            yield node
+
+
+def _subiterator(tree, forward):
+    """Returns an iterator over the children of a tree"""
+    children = tree._children
+    return iter(children) if forward else reversed(children)
+
+
+# The implementations of __recur__ and is_leaf that the fast path can
+# bypass by accessing _children directly.
+_FAST_RECUR = frozenset((Tree.__recur__, TreeSnapshot.__recur__))
+_FAST_IS_LEAF = frozenset((Tree.is_leaf, TreeSnapshot.is_leaf))